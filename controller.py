@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import argparse
 import os.path
 import re
 import sys
@@ -9,9 +8,64 @@ from typing import Any
 from controllerlib import action, docker
 
 VERSION_FILE = "version"
+VERSION_KEY_PREFIX = 'UNIFI_VERSION="'
 SERVER_PREFIX_DEFAULT = "unifi-network-controller"
 SERVER_PREFIX_ALLOWED_REGEXP = r"^[a-zA-Z0-9][a-zA-Z0-9_-]+[a-zA-Z0-9]$"
 
+_SERVER_PREFIX_RE = re.compile(SERVER_PREFIX_ALLOWED_REGEXP)
+_VERSION_PATH = os.path.join(os.path.dirname(__file__), VERSION_FILE)
+
+HELP_OPTION_SERVER_PREFIX = f"""  --server-prefix SERVER_PREFIX
+                        prefix for controller container and associated mounted
+                        volumes (default: {SERVER_PREFIX_DEFAULT})"""
+
+HELP_TEXT = """usage: controller.py [-h] {start,stop,backup,restore} ...
+
+Execution and management for UniFi Network Controller Docker image
+
+positional arguments:
+  {start,stop,backup,restore}
+
+optional arguments:
+  -h, --help            show this help message and exit"""
+
+COMMAND_HELP_TEXT = {
+    "start": f"""usage: controller.py start [-h] [--no-host-network]
+                           [--server-prefix SERVER_PREFIX]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --no-host-network     disable Docker host networking (may break ability to
+                        locate local network devices)
+{HELP_OPTION_SERVER_PREFIX}""",
+    "stop": f"""usage: controller.py stop [-h] [--server-prefix SERVER_PREFIX]
+
+optional arguments:
+  -h, --help            show this help message and exit
+{HELP_OPTION_SERVER_PREFIX}""",
+    "backup": f"""usage: controller.py backup [-h] --file ARCHIVE
+                            [--server-prefix SERVER_PREFIX]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --file ARCHIVE        target backup archive
+{HELP_OPTION_SERVER_PREFIX}""",
+    "restore": f"""usage: controller.py restore [-h] --file ARCHIVE
+                             [--server-prefix SERVER_PREFIX]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --file ARCHIVE        source backup archive
+{HELP_OPTION_SERVER_PREFIX}""",
+}
+
+COMMAND_OPTION_LIST = {
+    "start": ("--no-host-network", "--server-prefix"),
+    "stop": ("--server-prefix",),
+    "backup": ("--file", "--server-prefix"),
+    "restore": ("--file", "--server-prefix"),
+}
+
 
 def exit_error(message: str) -> None:
     print(f"Error: {message}", file=sys.stderr)
@@ -19,55 +73,65 @@ def exit_error(message: str) -> None:
 
 
 def read_arguments() -> tuple[str, dict[str, Any]]:
-    # create parser
-    parser = argparse.ArgumentParser(
-        description="Execution and management for UniFi Network Controller Docker image"
-    )
-    subparsers = parser.add_subparsers(dest="command")
-
-    def add_server_prefix(parser):
-        parser.add_argument(
-            "--server-prefix",
-            default=SERVER_PREFIX_DEFAULT,
-            help="prefix for controller container and associated mounted volumes (default: %(default)s)",
+    # hand rolled parser for small, fixed command set - avoids argparse import/setup cost
+    arg_list = sys.argv[1:]
+    if not arg_list:
+        # no command given
+        exit_error("no command given, require one of {start,stop,backup,restore}")
+
+    command = arg_list[0]
+    if command in ("-h", "--help"):
+        print(HELP_TEXT)
+        sys.exit(0)
+
+    if command not in COMMAND_OPTION_LIST:
+        exit_error(
+            f"invalid command [{command}], require one of {{start,stop,backup,restore}}"
         )
 
-    # command - start
-    parser_start = subparsers.add_parser("start")
-    parser_start.add_argument(
-        "--no-host-network",
-        action="store_true",
-        help="disable Docker host networking (may break ability to locate local network devices)",
-    )
+    # parse command options
+    option_list = {
+        "file": None,
+        "no_host_network": False,
+        "server_prefix": SERVER_PREFIX_DEFAULT,
+    }
+
+    arg_iter = iter(arg_list[1:])
+    for arg in arg_iter:
+        if arg in ("-h", "--help"):
+            print(COMMAND_HELP_TEXT[command])
+            sys.exit(0)
+
+        name, has_value, value = arg.partition("=")
+        if name not in COMMAND_OPTION_LIST[command]:
+            exit_error(f"unrecognized argument [{arg}] for command [{command}]")
 
-    add_server_prefix(parser_start)
+        if name == "--no-host-network":
+            if has_value:
+                exit_error(f"argument [{name}] does not accept a value")
 
-    # command - stop
-    parser_stop = subparsers.add_parser("stop")
-    add_server_prefix(parser_stop)
+            option_list["no_host_network"] = True
+            continue
 
-    # command - backup
-    parser_backup = subparsers.add_parser("backup")
-    parser_backup.add_argument(
-        "--file", help="target backup archive", metavar="ARCHIVE", required=True
-    )
+        if not has_value:
+            next_arg = next(arg_iter, None)
+            if (next_arg is None) or next_arg.startswith("-"):
+                exit_error(f"argument [{name}] expects a value")
+                return ("", {})
 
-    add_server_prefix(parser_backup)
+            value = next_arg
 
-    # command - restore
-    parser_restore = subparsers.add_parser("restore")
-    parser_restore.add_argument(
-        "--file", help="source backup archive", metavar="ARCHIVE", required=True
-    )
+        option_list[name[2:].replace("-", "_")] = value
 
-    add_server_prefix(parser_restore)
+    if "--file" in COMMAND_OPTION_LIST[command] and option_list["file"] is None:
+        exit_error("argument [--file] is required")
 
-    arg_list = parser.parse_args()
+    server_prefix = option_list["server_prefix"]
 
     def validate_server_prefix():
-        if not re.search(SERVER_PREFIX_ALLOWED_REGEXP, arg_list.server_prefix):
+        if not _SERVER_PREFIX_RE.search(server_prefix):
             exit_error(
-                f"invalid --server-prefix of [{arg_list.server_prefix}], expecting {SERVER_PREFIX_ALLOWED_REGEXP}"
+                f"invalid --server-prefix of [{server_prefix}], expecting {SERVER_PREFIX_ALLOWED_REGEXP}"
             )
 
     def file_path_canonical(file):
@@ -77,69 +141,61 @@ def read_arguments() -> tuple[str, dict[str, Any]]:
 
         return (directory, filename)
 
-    if arg_list.command == "start":
+    if command == "start":
         validate_server_prefix()
         return (
             "start",
             {
-                "no_host_network": arg_list.no_host_network,
-                "server_prefix": arg_list.server_prefix,
+                "no_host_network": option_list["no_host_network"],
+                "server_prefix": server_prefix,
             },
         )
 
-    if arg_list.command == "stop":
+    if command == "stop":
         validate_server_prefix()
-        return ("stop", {"server_prefix": arg_list.server_prefix})
+        return ("stop", {"server_prefix": server_prefix})
 
-    if arg_list.command == "backup":
+    if command == "backup":
         validate_server_prefix()
         return (
             "backup",
             {
-                "file": file_path_canonical(arg_list.file),
-                "server_prefix": arg_list.server_prefix,
+                "file": file_path_canonical(option_list["file"]),
+                "server_prefix": server_prefix,
             },
         )
 
-    if arg_list.command == "restore":
+    if command == "restore":
         validate_server_prefix()
         return (
             "restore",
             {
-                "file": file_path_canonical(arg_list.file),
-                "server_prefix": arg_list.server_prefix,
+                "file": file_path_canonical(option_list["file"]),
+                "server_prefix": server_prefix,
             },
         )
 
-    # no command given
-    exit_error("no command given, require one of {start,stop,backup,restore}")
     return ("", {})
 
 
 def load_version() -> str:
-    # load version file
-    line_list = []
-    file_path = f"{os.path.dirname(__file__)}/{VERSION_FILE}"
-
+    # stream version file lines, looking for last version definition
+    version = None
     try:
-        fh = open(file_path, "r")
-        line_list = fh.readlines()
-        fh.close()
+        with open(_VERSION_PATH, "r") as fh:
+            for line in fh:
+                if line.startswith(VERSION_KEY_PREFIX):
+                    value, quote, _ = line[len(VERSION_KEY_PREFIX) :].partition('"')
+                    if value and quote:
+                        version = value
     except OSError:
-        exit_error(f"unable to open version file at [{file_path}]")
-
-    # scan lines, looking for last version definition
-    version = None
-    for line in line_list:
-        match = re.search(r'^UNIFI_VERSION="([^"]+)"', line)
-        if match:
-            version = match.group(1)
+        exit_error(f"unable to open version file at [{_VERSION_PATH}]")
 
     if version is not None:
         return version
 
     # not found
-    exit_error(f"unable to determine image version from [{file_path}]")
+    exit_error(f"unable to determine image version from [{_VERSION_PATH}]")
     return ""
 
 
@@ -1,6 +1,5 @@
 import os
-import tarfile
-from typing import AbstractSet
+from typing import AbstractSet, Any, Callable
 
 from controllerlib import docker
 
@@ -12,6 +11,8 @@ CONTROLLER_BASE_DIR = "/usr/lib/unifi"
 BACKUP_REPOSITORY_NAME = "alpine"
 BACKUP_RESTORE_BACKUP_PATH = "/backup"
 BACKUP_RESTORE_VOLUME_MOUNT_PATH = "/data"
+# gzip - supported by BusyBox tar within stock backup image and Python tarfile for restore verification
+BACKUP_ARCHIVE_COMPRESS_ARG = "-z"
 BACKUP_ARCHIVE_KEY_FILE_LIST = [
     "./db/version",
     "./db/WiredTiger",
@@ -21,19 +22,26 @@ BACKUP_ARCHIVE_KEY_FILE_LIST = [
 
 
 def start_server(image_tag: str, server_prefix: str, no_host_network: bool) -> None:
-    # confirm controller Docker image exists, if not pull it
-    _image_pull(CONTROLLER_REPOSITORY_NAME, image_tag)
-
-    # query containers, confirm server container does not exist, otherwise exit
     container_name = _container_server_name(server_prefix)
-    if container_name in dict(docker.container_list()):
-        raise FatalError(f"container [{container_name}] already exists")
-
-    # query Docker volumes, create any that are required
     volume_name_data = _volume_data_name(server_prefix)
     volume_name_logs = _volume_logs_name(server_prefix)
 
-    volume_list = dict(docker.volume_list()).keys()
+    # query image/containers/volumes in a single concurrent pass
+    image_exists, container_list, volume_list = _docker_state(
+        lambda: docker.image_exists(CONTROLLER_REPOSITORY_NAME, image_tag),
+        docker.container_name_set,
+        docker.volume_name_set,
+    )
+
+    # confirm controller Docker image exists, if not pull it
+    if not image_exists:
+        _image_pull(CONTROLLER_REPOSITORY_NAME, image_tag)
+
+    # confirm server container does not exist, otherwise exit
+    if container_name in container_list:
+        raise FatalError(f"container [{container_name}] already exists")
+
+    # create any Docker volumes that are required
     _volume_create(volume_name_data, volume_list)
     _volume_create(volume_name_logs, volume_list)
 
@@ -67,13 +75,13 @@ def start_server(image_tag: str, server_prefix: str, no_host_network: bool) -> N
 
 def stop_server(server_prefix: str) -> None:
     container_name = _container_server_name(server_prefix)
-    container_list = dict(docker.container_list())
+    container = _container_find(container_name)
 
     # confirm server container exists and is running
-    if container_name not in container_list:
+    if container is None:
         raise FatalError(f"container [{container_name}] not does exist")
 
-    if not container_list[container_name]["running"]:
+    if not container["running"]:
         raise FatalError(f"container [{container_name}] not running")
 
     print(f"Stopping server [{container_name}]")
@@ -87,62 +95,87 @@ def stop_server(server_prefix: str) -> None:
 
 
 def backup(server_prefix: str, archive_dir: str, archive_name: str) -> None:
-    # confirm data volume for backup exists
     volume_name_data = _volume_data_name(server_prefix)
-    if volume_name_data not in dict(docker.volume_list()):
+    archive_path = f"{archive_dir}/{archive_name}"
+
+    # query image/volumes in a single concurrent pass
+    image_exists, volume_list = _docker_state(
+        lambda: docker.image_exists(BACKUP_REPOSITORY_NAME, "latest"),
+        docker.volume_name_set,
+    )
+
+    # confirm data volume for backup exists
+    if volume_name_data not in volume_list:
         raise FatalError(f"data volume [{volume_name_data}] does not exist for backup")
 
     # confirm image used for backup exists, if not pull it
-    _image_pull(BACKUP_REPOSITORY_NAME)
+    if not image_exists:
+        _image_pull(BACKUP_REPOSITORY_NAME)
 
+    # create archive on host - owned by current user
     try:
-        # execute backup of volume - using temporary container
-        docker.container_run(
-            image_repository=BACKUP_REPOSITORY_NAME,
-            bind_list=[(archive_dir, BACKUP_RESTORE_BACKUP_PATH)],
-            command_arg_list=[
-                "/bin/sh",
-                "-c",
-                _backup_archive_cmd(f"{BACKUP_RESTORE_BACKUP_PATH}/{archive_name}"),
-            ],
-            remove_on_exit=True,
-            volume_list=[(volume_name_data, BACKUP_RESTORE_VOLUME_MOUNT_PATH)],
-        )
+        archive_fh = open(archive_path, "wb")
+    except OSError:
+        raise FatalError(f"unable to create archive [{archive_path}]")
+
+    try:
+        # execute backup of volume - using temporary container, tar archive streamed via stdout into host file
+        with archive_fh:
+            docker.container_run(
+                image_repository=BACKUP_REPOSITORY_NAME,
+                command_arg_list=_backup_archive_cmd(),
+                remove_on_exit=True,
+                stdout_file=archive_fh,
+                volume_list=[(volume_name_data, BACKUP_RESTORE_VOLUME_MOUNT_PATH)],
+            )
     except docker.DockerError:
+        # remove partial archive
+        os.remove(archive_path)
         raise FatalError(f"unable to backup data volume [{volume_name_data}]")
 
-    print(f"Backup successfully created at [{archive_dir}/{archive_name}]")
+    print(f"Backup successfully created at [{archive_path}]")
 
 
-def _backup_archive_cmd(file: str) -> str:
-    # command to a) create tar archive of data volume b) change ownership to current user
-    return (
-        f'/bin/tar c -zf "{file}" -C "{BACKUP_RESTORE_VOLUME_MOUNT_PATH}" . && '
-        f'chown {os.getuid()}:{os.getgid()} "{file}"'
-    )
+def _backup_archive_cmd() -> list[str]:
+    # command to create tar archive of data volume, written to stdout
+    return [
+        "/bin/tar",
+        "c",
+        BACKUP_ARCHIVE_COMPRESS_ARG,
+        "-f",
+        "-",
+        "-C",
+        BACKUP_RESTORE_VOLUME_MOUNT_PATH,
+        ".",
+    ]
 
 
 def restore(server_prefix: str, archive_dir: str, archive_name: str) -> None:
+    container_name = _container_server_name(server_prefix)
+    volume_name_data = _volume_data_name(server_prefix)
+    archive_path = f"{archive_dir}/{archive_name}"
+    archive_file = f"{BACKUP_RESTORE_BACKUP_PATH}/{archive_name}"
+
     # confirm archive exists/is an archive and contains controller data files
-    _restore_verify_archive(f"{archive_dir}/{archive_name}")
+    _restore_verify_archive(archive_path)
 
     # data archive considered valid
+    # query image/containers/volumes in a single concurrent pass
+    image_exists, container, volume_list = _docker_state(
+        lambda: docker.image_exists(BACKUP_REPOSITORY_NAME, "latest"),
+        lambda: _container_find(container_name),
+        docker.volume_name_set,
+    )
+
     # confirm controller isn't currently running as we're rebuilding the data volume and it can't be in use
-    container_name = _container_server_name(server_prefix)
-    for name, data in docker.container_list():
-        if name == container_name and data["running"]:
-            raise FatalError(
-                f"container [{container_name}] currently running, "
-                "associated data volume must not be in use for restore"
-            )
+    if container is not None and container["running"]:
+        raise FatalError(
+            f"container [{container_name}] currently running, "
+            "associated data volume must not be in use for restore"
+        )
 
     # remove (possible) existing data volume
-    volume_name_data = _volume_data_name(server_prefix)
-    for name, _ in docker.volume_list():
-        if name != volume_name_data:
-            continue
-
-        # found existing volume - remove it
+    if volume_name_data in volume_list:
         try:
             docker.volume_delete(volume_name_data)
             print(f"Removed existing data volume [{volume_name_data}]")
@@ -152,7 +185,9 @@ def restore(server_prefix: str, archive_dir: str, archive_name: str) -> None:
             )
 
     # confirm image used for restore exists, if not pull it and create new volume
-    _image_pull(BACKUP_REPOSITORY_NAME)
+    if not image_exists:
+        _image_pull(BACKUP_REPOSITORY_NAME)
+
     _volume_create(volume_name_data)
 
     # restore archive into new data volume
@@ -161,37 +196,44 @@ def restore(server_prefix: str, archive_dir: str, archive_name: str) -> None:
         docker.container_run(
             image_repository=BACKUP_REPOSITORY_NAME,
             bind_list=[(archive_dir, BACKUP_RESTORE_BACKUP_PATH)],
-            command_arg_list=[
-                "/bin/sh",
-                "-c",
-                _restore_archive_cmd(f"{BACKUP_RESTORE_BACKUP_PATH}/{archive_name}"),
-            ],
+            command_arg_list=_restore_archive_cmd(archive_file),
             remove_on_exit=True,
             volume_list=[(volume_name_data, BACKUP_RESTORE_VOLUME_MOUNT_PATH)],
+            workdir=BACKUP_RESTORE_VOLUME_MOUNT_PATH,
         )
     except docker.DockerError:
         raise FatalError(f"unable to restore data volume [{volume_name_data}]")
 
-    print(f"Data volume successfully restored from [{archive_dir}/{archive_name}]")
+    print(f"Data volume successfully restored from [{archive_path}]")
 
 
 def _restore_verify_archive(archive_path: str) -> None:
-    # open archive, confirm it's a tar file
+    # deferred import - only restore requires tarfile (and its compression modules)
+    import tarfile
+
+    # open archive as a stream (no random access member index), confirm it's a tar file
     try:
-        archive_tar = tarfile.open(archive_path, mode="r")
+        archive_tar = tarfile.open(archive_path, mode="r|*")
     except OSError:
         raise FatalError(f"unable to open archive [{archive_path}]")
     except tarfile.TarError:
         raise FatalError(f"it appears [{archive_path}] is not a tar file")
 
-    # analyse, confirming it contains key controller data files
-    key_file_count = 0
-    for tar_file in archive_tar.getmembers():
-        if tar_file.name in BACKUP_ARCHIVE_KEY_FILE_LIST:
-            key_file_count += 1
-
-    archive_tar.close()
-    if key_file_count < len(BACKUP_ARCHIVE_KEY_FILE_LIST):
+    # analyse, confirming it contains key controller data files - stop once all are found
+    key_file_set = set(BACKUP_ARCHIVE_KEY_FILE_LIST)
+    found_file_set = set()
+    try:
+        for tar_file in archive_tar:
+            if tar_file.name in key_file_set:
+                found_file_set.add(tar_file.name)
+                if found_file_set == key_file_set:
+                    break
+    except (OSError, tarfile.TarError):
+        raise FatalError(f"unable to read archive [{archive_path}]")
+    finally:
+        archive_tar.close()
+
+    if found_file_set != key_file_set:
         # didn't find every file expected
         raise FatalError(
             f"archive [{archive_path}] doesn't appear to be a controller data backup"
@@ -200,9 +242,10 @@ def _restore_verify_archive(archive_path: str) -> None:
     # archive passed verification
 
 
-def _restore_archive_cmd(file: str) -> str:
-    # command to a) move into the root of the Docker volume b) extract tar mounted at host into volume
-    return f'cd "{BACKUP_RESTORE_VOLUME_MOUNT_PATH}" && tar x -f "{file}"'
+def _restore_archive_cmd(file: str) -> list[str]:
+    # command to extract tar mounted at host into volume (run from the root of the Docker volume)
+    # note: compression type is auto-detected by tar
+    return ["/bin/tar", "x", "-f", file]
 
 
 def _container_server_name(server_prefix: str) -> str:
@@ -217,12 +260,32 @@ def _volume_logs_name(server_prefix: str) -> str:
     return f"{server_prefix}-logs"
 
 
+def _container_find(name: str) -> dict[str, Any] | None:
+    # return details of container by name - stopping at first match
+    for container_name, data in docker.container_list():
+        if container_name == name:
+            return data
+
+    return None
+
+
+def _docker_state(*query_list: Callable[[], Any]) -> list[Any]:
+    # execute Docker CLI list queries concurrently - each is an independent wait on the Docker daemon
+    # returns each query result in argument order, e.g. bool for docker.image_exists(),
+    # set[str] for docker.*_name_set()
+    # deferred import - avoids loading threading/queue modules for actions not querying state
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(query_list)) as executor:
+        future_list = [executor.submit(query) for query in query_list]
+        try:
+            return [future.result() for future in future_list]
+        except docker.DockerError as err:
+            raise FatalError(str(err))
+
+
 def _image_pull(repository: str, tag: str = "latest") -> None:
     image_name = f"{repository}:{tag}"
-    if image_name in dict(docker.image_list()):
-        # no work
-        return
-
     print(f"Docker image [{image_name}] not available - attempting to pull")
 
     try:
@@ -233,7 +296,9 @@ def _image_pull(repository: str, tag: str = "latest") -> None:
     print("Successfully pulled Docker image")
 
 
-def _volume_create(name: str, existing_volume_list: AbstractSet[str] = set()) -> None:
+def _volume_create(
+    name: str, existing_volume_list: AbstractSet[str] = frozenset()
+) -> None:
     if name in existing_volume_list:
         # no work
         return
@@ -1,62 +1,82 @@
-import json
-import re
+import shutil
 import subprocess
-from typing import Generator
+from typing import Any, BinaryIO, Callable, Generator, Sequence
 
-DOCKER_CLI_ARG_FORMAT_JSON = "--format={{json .}}"
-_docker_cli_bin = ""
+_json_loads: Callable[[bytes], Any]
+try:
+    # optional faster JSON parser, otherwise fallback to standard library
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+
+
+def _format_json_fields(*field_list: str) -> str:
+    # build --format template emitting a JSON object of only the given fields
+    field_template = ",".join(
+        f'"{field}":{{{{json .{field}}}}}' for field in field_list
+    )
+    return f"--format={{{field_template}}}"
+
+
+DOCKER_CLI_ARG_FORMAT_CONTAINER = _format_json_fields("ID", "Image", "Names", "Status")
+
+
+def _resolve_cli_argv() -> tuple[str, ...]:
+    # argument prefix for Docker CLI calls - empty if binary not found
+    docker_cli_bin = shutil.which("docker")
+    return (docker_cli_bin,) if docker_cli_bin else ()
+
+
+# resolve path to Docker CLI binary once at import
+_docker_cli_argv = _resolve_cli_argv()
 
 
 def find_cli() -> bool:
-    global _docker_cli_bin
-    if _docker_cli_bin != "":
-        return True
+    global _docker_cli_argv
+    if not _docker_cli_argv:
+        # not found at import - retry lookup
+        _docker_cli_argv = _resolve_cli_argv()
 
-    result = _run_command(["which", "docker"])
-    if result.code != 0:
-        # CLI not found
-        return False
+    return bool(_docker_cli_argv)
 
-    # cache path to binary
-    _docker_cli_bin = result.stdout[0]
-    return True
 
+def image_exists(repository: str, tag: str) -> bool:
+    # note: stderr captured to silence (and detect) "no such image" message from CLI
+    result = _run_command(
+        ["image", "inspect", "--format={{.Id}}", f"{repository}:{tag}"]
+    )
+    if result.code == 0:
+        return True
 
-def image_list() -> Generator[tuple[str, dict[str, str]], None, None]:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "images", DOCKER_CLI_ARG_FORMAT_JSON])
-    if result.code != 0:
-        raise DockerError("unable to list images")
+    if b"No such image" in result.stderr_raw:
+        return False
 
-    for image in result.stdout:
-        image = json.loads(image)
-        yield (
-            f"{image['Repository']}:{image['Tag']}",
-            {
-                "id": image["ID"],
-                "repository": image["Repository"],
-                "size": image["Size"],
-                "tag": image["Tag"],
-            },
-        )
+    # any other failure (e.g. Docker daemon unavailable)
+    raise DockerError("unable to inspect image")
 
 
 def container_list() -> Generator[tuple[str, dict[str, str]], None, None]:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "ps", "--all", DOCKER_CLI_ARG_FORMAT_JSON])
+    result = _run_command(
+        ["ps", "--all", DOCKER_CLI_ARG_FORMAT_CONTAINER], capture_stderr=False
+    )
     if result.code != 0:
         raise DockerError("unable to list containers")
 
     def exit_code(status):
         # attempt to extract process exit code from container (won't match if running)
-        match = re.search(r"^Exited \(([0-9]+)\)", status)
-        if match:
-            return int(match.group(1))
+        if status.startswith("Exited ("):
+            code, paren, _ = status[8:].partition(")")
+            if paren and code.isdigit():
+                return int(code)
 
         return None
 
-    for container in result.stdout:
-        container = json.loads(container)
+    for container in result.stdout_raw.splitlines():
+        container = _json_loads(container)
         status = container["Status"]
 
         yield (
@@ -71,34 +91,36 @@ def container_list() -> Generator[tuple[str, dict[str, str]], None, None]:
         )
 
 
-def volume_list() -> Generator[tuple[str, dict[str, str]], None, None]:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "volume", "ls", DOCKER_CLI_ARG_FORMAT_JSON])
+def container_name_set() -> set[str]:
+    result = _run_command(["ps", "--all", "--format={{.Names}}"], capture_stderr=False)
+    if result.code != 0:
+        raise DockerError("unable to list containers")
+
+    return set(result.stdout_raw.decode().splitlines())
+
+
+def volume_name_set() -> set[str]:
+    result = _run_command(["volume", "ls", "--format={{.Name}}"], capture_stderr=False)
     if result.code != 0:
         raise DockerError("unable to list volumes")
 
-    for volume in result.stdout:
-        volume = json.loads(volume)
-        yield (volume["Name"], {"mount_point": volume["Mountpoint"]})
+    return set(result.stdout_raw.decode().splitlines())
 
 
 def image_pull(repository: str, tag: str) -> None:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "pull", "--quiet", f"{repository}:{tag}"])
+    result = _run_command(["pull", "--quiet", f"{repository}:{tag}"])
     if result.code != 0:
         raise DockerError("unable to pull image")
 
 
 def volume_create(name: str) -> None:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "volume", "create", name])
+    result = _run_command(["volume", "create", name])
     if result.code != 0:
         raise DockerError("unable to create volume")
 
 
 def volume_delete(name: str) -> None:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "volume", "rm", name])
+    result = _run_command(["volume", "rm", name])
     if result.code != 0:
         raise DockerError("unable to delete volume")
 
@@ -106,19 +128,24 @@ def volume_delete(name: str) -> None:
 def container_run(
     image_repository: str,
     image_tag: str = "latest",
-    bind_list: list[tuple[str, str]] = [],
-    command_arg_list: list[str] = [],
+    bind_list: Sequence[tuple[str, str]] | None = None,
+    command_arg_list: Sequence[str] | None = None,
     detach: bool = False,
     name: str | None = None,
     network_host: bool = False,
-    publish_list: list[tuple[int, int]] = [],
+    publish_list: Sequence[tuple[int, int]] | None = None,
     remove_on_exit: bool = False,
-    volume_list: list[tuple[str, str]] = [],
+    stdout_file: BinaryIO | None = None,
+    volume_list: Sequence[tuple[str, str]] | None = None,
+    workdir: str | None = None,
 ) -> bool | str:
-    _cli_exists()
+    bind_list = bind_list or ()
+    command_arg_list = command_arg_list or ()
+    publish_list = publish_list or ()
+    volume_list = volume_list or ()
 
     # build run arguments
-    run_arg_list = [_docker_cli_bin, "run"]
+    run_arg_list = ["run"]
 
     if detach:
         run_arg_list.append("--detach")
@@ -146,54 +173,65 @@ def container_run(
     if remove_on_exit:
         run_arg_list.append("--rm")
 
+    if workdir is not None:
+        run_arg_list.extend(["--workdir", workdir])
+
     run_arg_list.append(f"{image_repository}:{image_tag}")
     run_arg_list.extend(command_arg_list)
 
-    result = _run_command(run_arg_list)
+    result = _run_command(run_arg_list, stdout_file=stdout_file)
     if result.code != 0:
         raise DockerError("unable to run image")
 
-    if len(result.stdout) == 1:
-        return result.stdout[0]
+    line_list = result.lines
+    if len(line_list) == 1:
+        return line_list[0].decode()
 
     # didn't get a container ID back
     return False
 
 
 def container_stop(name: str) -> None:
-    _cli_exists()
-    result = _run_command([_docker_cli_bin, "stop", name])
+    result = _run_command(["stop", name])
     if result.code != 0:
         raise DockerError("unable to stop container")
 
 
 class _RunCommandResult:
     def __init__(self, code, stdout, stderr):
-        # store stdout/err lines as lists - if no lines, ensure to return empty list
-        def split(output):
-            line_list = output.rstrip().split("\n")
-            if (len(line_list) == 1) and (line_list[0] == ""):
-                return []
-
-            return line_list
-
+        # store raw stdout/err bytes - callers split/decode only as needed
         self.code = code
-        self.stdout = split(stdout)
-        self.stderr = split(stderr)
-
-
-def _run_command(argument_list: list[str]) -> _RunCommandResult:
-    result = subprocess.run(
-        argument_list, encoding="utf-8", stderr=subprocess.PIPE, stdout=subprocess.PIPE
-    )
-
-    return _RunCommandResult(result.returncode, result.stdout, result.stderr)
-
-
-def _cli_exists() -> None:
-    if not find_cli():
+        self.stdout_raw = stdout
+        self.stderr_raw = stderr
+
+    @property
+    def lines(self) -> list[bytes]:
+        # stdout as list of lines - if no output, returns empty list
+        return self.stdout_raw.splitlines()
+
+
+def _run_command(
+    argument_list: list[str],
+    capture_stderr: bool = True,
+    stdout_file: BinaryIO | None = None,
+) -> _RunCommandResult:
+    # execute Docker CLI with given arguments
+    # if stdout_file given, stdout is streamed directly into file rather than captured
+    if not _docker_cli_argv:
         raise DockerError("unable to locate Docker CLI")
 
+    # note: close_fds=False allows CPython to use posix_spawn() over fork()/exec() where possible,
+    # read-only queries don't capture stderr (inherited from parent) saving a pipe per call
+    with subprocess.Popen(
+        (*_docker_cli_argv, *argument_list),
+        close_fds=False,
+        stderr=subprocess.PIPE if capture_stderr else None,
+        stdout=subprocess.PIPE if stdout_file is None else stdout_file,
+    ) as process:
+        stdout, stderr = process.communicate()
+
+    return _RunCommandResult(process.returncode, stdout or b"", stderr or b"")
+
 
 class DockerError(Exception):
     pass